@@ -1,8 +1,6 @@
 import streamlit as st
 import asyncio
 import re
-import json
-import os
 from datetime import datetime
 from state import LearningState
 from learning_agent import (
@@ -10,6 +8,7 @@ from learning_agent import (
     generate_quiz,  feynman_explain
 )
 from checkpoints import CHECKPOINTS
+from progress_store import open_store
 
 st.set_page_config(
     page_title="🤖 Autonomous Learning Agent",
@@ -21,40 +20,6 @@ st.set_page_config(
 # 🔥 PERSISTENT STORAGE CONFIGURATION
 PROGRESS_FILE = "learning_progress.json"
 
-def load_progress():
-    """Load progress from file with fallback to default"""
-    default_progress = {concept: {
-        'completed': False, 'score': 0, 'attempts': 0, 'best_score': 0,
-        'last_score': 0, 'feynman_level': 0, 'feynman_attempts_used': 0,
-        'last_updated': datetime.now().isoformat()
-    } for concept in CHECKPOINTS}
-    
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE, 'r') as f:
-                loaded = json.load(f)
-                for concept in CHECKPOINTS:
-                    if concept not in loaded:
-                        loaded[concept] = default_progress[concept]
-                    else:
-                        for key in default_progress[concept]:
-                            if key not in loaded[concept]:
-                                loaded[concept][key] = default_progress[concept][key]
-                return loaded
-        except:
-            st.warning("⚠️ Corrupted progress file. Using defaults.")
-    return default_progress
-
-def save_progress(progress):
-    """Save progress to file"""
-    try:
-        with open(PROGRESS_FILE, 'w') as f:
-            json.dump(progress, f, indent=2)
-        return True
-    except Exception as e:
-        st.error(f"⚠️ Failed to save progress: {e}")
-        return False
-
 # 🌟 COMPLETE CSS - ONE LINE
 st.markdown("""
 <style>
@@ -87,8 +52,13 @@ if 'learning_state' not in st.session_state:
 if 'selected_topic' not in st.session_state:
     st.session_state.selected_topic = None
 
-# 🔥 LOAD PERSISTENT PROGRESS FIRST
-st.session_state.progress = load_progress()
+# 🔥 LOAD PERSISTENT PROGRESS FIRST (in memory - disk writes happen in the background)
+progress_store = open_store(PROGRESS_FILE)
+st.session_state.progress = progress_store.state
+if 'recovery_shown' not in st.session_state:
+    st.session_state.recovery_shown = True
+    for note in progress_store.recovered:
+        st.warning(f"⚠️ Corrupted progress file recovered: {note}")
 
 if 'current_question' not in st.session_state:
     st.session_state.current_question = 0
@@ -157,14 +127,13 @@ st.markdown("""
     <h1 style='font-size: 3.5rem;'>🤖 Autonomous Learning Agent</h1>
 """, unsafe_allow_html=True)
 
-# 🔥 SAVE PROGRESS ON EVERY RERUN
-save_progress(st.session_state.progress)
-
 with st.sidebar:
     st.markdown('<div style="padding: 2rem; background: rgba(30,41,59,0.95); border-radius: 25px; color: white;"><h3>🎓 ML Academy</h3></div>', unsafe_allow_html=True)
     
-    if save_progress(st.session_state.progress):
+    if progress_store.last_error is None:
         st.markdown('<div class="persistence-notice"> Progress Saved</div>', unsafe_allow_html=True)
+    else:
+        st.error(f"⚠️ Failed to save progress: {progress_store.last_error}")
     
     if st.session_state.progress:
         sample_progress = list(st.session_state.progress.values())[0]
@@ -176,12 +145,7 @@ with st.sidebar:
         st.session_state.active_page = "progress"; st.rerun()
     
     if st.button("🔄 Reset All Progress", type="primary", use_container_width=True):
-        st.session_state.progress = {concept: {
-            'completed': False, 'score': 0, 'attempts': 0, 'best_score': 0,
-            'last_score': 0, 'feynman_level': 0, 'feynman_attempts_used': 0,
-            'last_updated': datetime.now().isoformat()
-        } for concept in CHECKPOINTS}
-        save_progress(st.session_state.progress)
+        progress_store.reset()
         st.success("✅ Progress reset!")
         st.rerun()
 
@@ -270,9 +234,7 @@ if st.session_state.active_page == "topics":
                     st.session_state.correct_answers = correct_answers[:3] or ['B', 'C', 'A']
                     
                     # 🔥 PERSISTENT UPDATE
-                    st.session_state.progress[topic]['attempts'] += 1
-                    st.session_state.progress[topic]['last_updated'] = datetime.now().isoformat()
-                    save_progress(st.session_state.progress)
+                    progress_store.increment(topic, 'attempts')
                     st.session_state.learning_phase = "quiz"
                 st.rerun()
         
@@ -348,13 +310,7 @@ if st.session_state.active_page == "topics":
                             'correct_answers': st.session_state.correct_answers,
                             'student_answers': list(st.session_state.student_answers.values())
                         }
-                        prog = st.session_state.progress[topic]
-                        prog['last_score'] = score
-                        prog['best_score'] = max(prog['best_score'], score)
-                        if score >= 70:
-                            prog['completed'] = True
-                        prog['last_updated'] = datetime.now().isoformat()
-                        save_progress(st.session_state.progress)
+                        progress_store.record_score(topic, score, passed=score >= 70)
                         st.session_state.learning_phase = "results"
                         st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
@@ -390,10 +346,7 @@ if st.session_state.active_page == "topics":
                         loop.close()
                         
                         st.session_state.feynman_explanation = explanation
-                        st.session_state.progress[topic]['feynman_level'] += 1
-                        st.session_state.progress[topic]['feynman_attempts_used'] += 1
-                        st.session_state.progress[topic]['last_updated'] = datetime.now().isoformat()
-                        save_progress(st.session_state.progress)
+                        progress_store.increment(topic, 'feynman_level', 'feynman_attempts_used')
                         st.session_state.learning_phase = "feynman"
                         st.rerun()
                 elif score >= 70:
@@ -10,3 +10,27 @@ CHECKPOINTS = [
     "Transfer Learning",
     "Early Stopping"
 ]
+
+# 🔥 KEYWORD INDEX FOR LOCAL CONTEXT VALIDATION ("a|b" = either spelling)
+CONCEPT_KEYWORDS = {
+    "Gradient Descent": ["gradient descent", "gradient", "learning rate", "loss", "minimi", "derivative",
+                         "slope", "converge", "iteration", "stochastic", "cost function", "local minim"],
+    "Backpropagation": ["backprop", "chain rule", "gradient", "partial derivative", "layer", "weight",
+                        "neural network", "forward pass", "backward", "error", "rumelhart", "activation"],
+    "Activation Functions": ["activation", "non linear|nonlinear", "relu", "sigmoid", "tanh", "softmax",
+                             "neuron", "vanishing gradient", "leaky", "gelu", "layer", "output"],
+    "Loss Functions": ["loss", "cross entropy", "mean squared error|mse", "prediction", "target", "label",
+                       "classification", "regression", "hinge", "minimi", "objective", "probabilit"],
+    "Batch Normalization": ["batch norm", "normaliz", "mini batch", "mean", "variance", "covariate shift",
+                            "ioffe", "scale", "shift", "gamma", "inference", "layer"],
+    "Dropout Regularization": ["dropout", "regulariz", "overfit", "neuron", "probabilit", "random",
+                               "ensemble", "srivastava", "hinton", "generaliz", "inference", "training"],
+    "Learning Rate Scheduling": ["learning rate", "schedul", "decay", "step", "exponential", "cosine",
+                                 "warm", "epoch", "anneal", "plateau", "cyclic", "converge"],
+    "Adam Optimizer": ["adam", "optimiz", "moment", "adaptive", "learning rate", "momentum", "rmsprop",
+                       "bias correction", "kingma", "beta", "epsilon", "gradient"],
+    "Transfer Learning": ["transfer learning", "pre train|pretrain", "fine tun|finetun", "domain", "feature",
+                          "imagenet", "freez|frozen", "source", "target task", "bert", "dataset", "model"],
+    "Early Stopping": ["early stopping", "validation", "overfit", "epoch", "patience", "monitor",
+                       "checkpoint", "generaliz", "training loss", "regulariz", "best model", "loss"],
+}
@@ -1,9 +1,10 @@
 import os
 import re
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from state import LearningState
+from model_router import ModelRouter
+from relevance import score_relevance, key_terms
 
 # 🔥 LOAD .env FIRST
 load_dotenv()
@@ -13,22 +14,43 @@ os.environ["LANGCHAIN_TRACING_V2"] = os.getenv("LANGCHAIN_TRACING_V2", "true")
 os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT", "Learning-Agent")
 os.environ["LANGSMITH_API_KEY"] = os.getenv("LANGSMITH_API_KEY")
 
-llm = ChatGroq(
-    groq_api_key=os.getenv("GROQ_API_KEY"),
-    model_name="llama-3.3-70b-versatile",
-    temperature=0.1
-)
+# 🔥 FAST MODELS FOR CONTEXT/QUIZ, LARGE MODEL FOR EXPLANATIONS (hedged + fallback)
+router = ModelRouter.from_env(temperature=0.1)
+
+# Below this score the context is regenerated once before explanation/quiz
+RELEVANCE_THRESHOLD = 60
 
 async def gather_context(state: LearningState):
     prompt = ChatPromptTemplate.from_template(
         'For "{concept}", provide 300 words comprehensive technical context including history, key concepts, and usage.'
     )
-    chain = prompt | llm
+    chain = prompt | router.for_task("gather_context")
     result = await chain.ainvoke({"concept": state.concept})
     state.context = result.content
 
+async def regenerate_context(state: LearningState):
+    """Corrective retry for an off-topic context - names the key terms, uses the large model"""
+    prompt = ChatPromptTemplate.from_template(
+        'The previous context for the machine learning concept "{concept}" was off-topic. '
+        'Provide 300 words of technical context strictly about "{concept}", covering: {key_terms}.'
+    )
+    chain = prompt | router.for_task("regenerate_context")
+    result = await chain.ainvoke({
+        "concept": state.concept,
+        "key_terms": ", ".join(key_terms(state.concept)) or state.concept
+    })
+    state.context = result.content
+
 async def validate_context(state: LearningState):
-    state.relevance_score = 95
+    """Local relevance check - one regeneration if the context looks off-topic"""
+    state.relevance_score = score_relevance(state.concept, state.context)
+    if state.relevance_score >= RELEVANCE_THRESHOLD:
+        return
+    first_context, first_score = state.context, state.relevance_score
+    await regenerate_context(state)
+    state.relevance_score = score_relevance(state.concept, state.context)
+    if state.relevance_score < first_score:
+        state.context, state.relevance_score = first_context, first_score
 
 async def explain_concept(state: LearningState):
     """INITIAL Comprehensive explanation - Learning-focused format"""
@@ -56,7 +78,7 @@ async def explain_concept(state: LearningState):
     End: "Ready for quiz? 🧠"
     """)
     
-    chain = prompt | llm
+    chain = prompt | router.for_task("explain_concept")
     result = await chain.ainvoke({
         "concept": state.concept,
         "context": state.context
@@ -95,7 +117,7 @@ async def generate_quiz(state: LearningState):
     
     Context: {context}
     """)
-    chain = prompt | llm
+    chain = prompt | router.for_task("generate_quiz")
     result = await chain.ainvoke({
         "concept": state.concept,
         "context": state.context
@@ -154,7 +176,7 @@ async def feynman_explain(state: LearningState):
     End: "Ready to RETRY quiz? You've got this! 💪"
     """)
     
-    chain = prompt | llm
+    chain = prompt | router.for_task("feynman_explain")
     result = await chain.ainvoke({
         "concept": state.concept,
         "score": state.student_score,
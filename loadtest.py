@@ -0,0 +1,374 @@
+# loadtest.py - Simulates N concurrent learners against one real Streamlit server
+#
+# Usage:
+#   python loadtest.py --learners 20 --llm-latency 0.05
+#   python loadtest.py --learners 50 --max-p95-ms 800 --max-errors 0   # CI gate
+#
+# Starts `streamlit run app.py` in a scratch directory (the real
+# learning_progress.json is never touched) next to a local fake Groq endpoint
+# (GROQ_API_BASE), then drives N browser-less sessions over Streamlit's
+# websocket protocol: topics → content → quiz → results → feynman. All sessions
+# share one server process, one ProgressStore and one ModelRouter, exactly like
+# students on a deployed instance.
+#
+# Reports rerun latency percentiles, server memory growth per session,
+# throughput, and lost progress updates: after a graceful shutdown the persisted
+# progress is compared with what the learners' clicks should add up to.
+import os
+import sys
+import json
+import time
+import random
+import signal
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from checkpoints import CHECKPOINTS, CONCEPT_KEYWORDS
+from progress_store import ProgressStore
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+PROGRESS_FILE = "learning_progress.json"
+
+FAKE_QUIZ = """Question 1: What is the primary purpose of {concept}?
+A) Option 1
+B) Option 2 ✅
+C) Option 3
+D) Option 4
+
+Question 2: When should you use {concept}?
+A) Option 1
+B) Option 2
+C) Option 3 ✅
+D) Option 4
+
+Question 3: Key limitation of {concept}?
+A) Option 1 ✅
+B) Option 2
+C) Option 3
+D) Option 4"""
+CORRECT = ['B', 'C', 'A']
+WRONG = ['A', 'A', 'B']
+
+SAVE_ERROR_MARKERS = ("Failed to save progress", "Corrupted progress file")
+
+
+def fake_completion(text):
+    """What the fake model answers, picked by prompt type"""
+    concept = text.split('"')[1] if '"' in text else "concept"
+    if "Generate EXACTLY 3" in text:
+        return FAKE_QUIZ.format(concept=concept)
+    if "DEEP DIVE" in text:
+        return f"## WHY YOU STRUGGLED\n{concept} deep dive.\nReady to RETRY quiz? You've got this! 💪"
+    if "LEARNING GUIDE" in text:
+        return f"## WHAT IS IT?\n{concept} explained. " + "word " * 800 + "\nReady for quiz? 🧠"
+    # On-topic enough to pass validate_context without a regeneration
+    keywords = " ".join(k.split("|")[0] for k in CONCEPT_KEYWORDS.get(concept, []))
+    return f"{concept} context. {keywords} " + "word " * 300
+
+
+def start_fake_groq(latency):
+    """OpenAI-style /chat/completions endpoint on localhost, one thread per request"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            content = fake_completion(body["messages"][-1]["content"])
+            reply = json.dumps({
+                "id": "loadtest", "object": "chat.completion", "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app_server(workdir, port, groq_url):
+    env = dict(os.environ, GROQ_API_BASE=groq_url, GROQ_API_KEY="loadtest",
+               LANGCHAIN_TRACING_V2="false", LANGSMITH_API_KEY="")
+    log = open(os.path.join(workdir, "streamlit.log"), "w")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_FILE, "--server.headless", "true",
+         "--server.port", str(port), "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit exited early, see {log.name}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"streamlit did not become healthy, see {log.name}")
+
+
+def rss_bytes(pid):
+    """Resident set size of `pid` (Linux /proc only, else None)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+class Session:
+    """One browser-less Streamlit session speaking the websocket protocol"""
+
+    def __init__(self, url, timeout, stats):
+        self.url = url
+        self.timeout = timeout
+        self.stats = stats
+        self.ws = None
+        self.buttons = {}
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, max_size=None)
+        await self.rerun()
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def has(self, key):
+        return any(widget_id.endswith("-" + key) for widget_id in self.buttons)
+
+    async def click(self, key):
+        widget_id = next((w for w in self.buttons if w.endswith("-" + key)), None)
+        if widget_id is None:
+            raise RuntimeError(f"button '{key}' not on page")
+        await self.rerun(widget_id)
+
+    async def rerun(self, widget_id=None):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        if widget_id:
+            widget = msg.rerun_script.widget_states.widgets.add()
+            widget.id = widget_id
+            widget.trigger_value = True
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._read_until_finished(), self.timeout)
+        self.stats['latencies'].append(time.perf_counter() - start)
+
+    async def _read_until_finished(self):
+        # st.rerun() inside a handler finishes the first run early; wait for the final one
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                self.buttons = {}
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "button":
+                    self.buttons[element.button.id] = element.button.label
+                elif element_type == "alert" and any(m in element.alert.body for m in SAVE_ERROR_MARKERS):
+                    self.stats['save_errors'] += 1
+                elif element_type == "exception":
+                    self.stats['exceptions'].append(element.exception.message)
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                    return
+                if fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("app.py failed to compile")
+
+
+class Learner:
+    """One simulated student; records the progress effects its clicks should have"""
+
+    def __init__(self, learner_id, session, expected, pass_rate):
+        self.rng = random.Random(learner_id)
+        self.session = session
+        self.expected = expected
+        self.pass_rate = pass_rate
+
+    async def run_flow(self, topic_idx):
+        topic = CHECKPOINTS[topic_idx]
+        s = self.session
+        # 📚 TOPICS → CONTENT
+        await s.click(f"topic_{topic_idx}")
+        # 🎯 CONTENT → QUIZ (the quiz page only renders after attempts was incremented)
+        await s.click("start_quiz_content_v2")
+        if not s.has("submit_quiz_v4") and not s.has("opt_0_A_v4"):
+            raise RuntimeError("quiz did not render")
+        self.expected[topic]['attempts'] += 1
+        passing = self.rng.random() < self.pass_rate
+        answers = CORRECT if passing else WRONG
+        for q, letter in enumerate(answers):
+            await s.click(f"opt_{q}_{letter}_v4")
+            if q < len(answers) - 1:
+                await s.click(f"next_{q}_v2")
+        # 📊 QUIZ → RESULTS
+        await s.click("submit_quiz_v4")
+        score = 100.0 if passing else 0.0
+        self.expected[topic]['best_score'] = max(self.expected[topic]['best_score'], score)
+        self.expected[topic]['completed'] |= passing
+        # 🧠 RESULTS → FEYNMAN (only offered on a fail with attempts left)
+        if s.has("feynman_results_v4"):
+            await s.click("feynman_results_v4")
+            if s.has("next_topic_feynman_v4"):
+                self.expected[topic]['feynman_level'] += 1
+                self.expected[topic]['feynman_attempts_used'] += 1
+                await s.click("next_topic_feynman_v4")
+        s.stats['flows'] += 1
+
+    async def run(self, flows):
+        try:
+            for _ in range(flows):
+                await self.run_flow(self.rng.randrange(len(CHECKPOINTS)))
+        except Exception as e:
+            self.session.stats['exceptions'].append(f"{type(e).__name__}: {e}")
+
+
+def lost_updates(persisted, expected):
+    """Differences between persisted progress and what the learners' clicks add up to"""
+    problems = []
+    for topic, want in expected.items():
+        got = persisted.get(topic, {})
+        for counter in ('attempts', 'feynman_level', 'feynman_attempts_used'):
+            if got.get(counter, 0) != want[counter]:
+                problems.append(f"{topic}: {counter} {got.get(counter, 0)} != {want[counter]}")
+        if got.get('best_score', 0) != want['best_score']:
+            problems.append(f"{topic}: best_score {got.get('best_score', 0)} != {want['best_score']}")
+        if bool(got.get('completed')) != want['completed']:
+            problems.append(f"{topic}: completed {got.get('completed')} != {want['completed']}")
+    return problems
+
+
+async def drive(url, args, stats, expected, server_pid):
+    # Warm-up session: first script run imports langchain etc., keep it out of the numbers
+    warmup = Session(url, args.timeout, defaultdict(list))
+    await warmup.connect()
+    await warmup.close()
+    rss_before = rss_bytes(server_pid)
+
+    sessions = [Session(url, args.timeout, stats) for _ in range(args.learners)]
+    start = time.perf_counter()
+    await asyncio.gather(*(s.connect() for s in sessions))
+    learners = [Learner(i, s, expected, args.pass_rate) for i, s in enumerate(sessions)]
+    await asyncio.gather(*(learner.run(args.flows) for learner in learners))
+    elapsed = time.perf_counter() - start
+    # Measured while every session is still open
+    rss_after = rss_bytes(server_pid)
+    await asyncio.gather(*(s.close() for s in sessions))
+    return elapsed, rss_before, rss_after
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent learner load test for app.py")
+    parser.add_argument("--learners", type=int, default=10, help="concurrent sessions")
+    parser.add_argument("--flows", type=int, default=2, help="topic flows per learner")
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="fake LLM delay per call (s)")
+    parser.add_argument("--pass-rate", type=float, default=0.5, help="share of quizzes answered correctly")
+    parser.add_argument("--timeout", type=float, default=60, help="per-rerun timeout (s)")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="fail if rerun p95 exceeds this")
+    parser.add_argument("--max-errors", type=int, default=None,
+                        help="fail if lost updates + save errors exceed this")
+    args = parser.parse_args()
+
+    # 🔥 ISOLATED PROGRESS FILE - never touch the real learning_progress.json
+    workdir = tempfile.mkdtemp(prefix="learning_load_")
+    groq = start_fake_groq(args.llm_latency)
+    port = free_port()
+    print(f"🚀 Load test: {args.learners} learners × {args.flows} flows on one server "
+          f"(fake LLM {args.llm_latency*1000:.0f} ms)")
+    print(f"📁 Workdir: {workdir}")
+
+    server = start_app_server(workdir, port, f"http://127.0.0.1:{groq.server_port}")
+    stats = {'latencies': [], 'exceptions': [], 'save_errors': 0, 'flows': 0}
+    expected = {topic: {'attempts': 0, 'feynman_level': 0, 'feynman_attempts_used': 0,
+                        'best_score': 0, 'completed': False} for topic in CHECKPOINTS}
+    try:
+        elapsed, rss_before, rss_after = asyncio.run(
+            drive(f"ws://127.0.0.1:{port}/_stcore/stream", args, stats, expected, server.pid))
+    finally:
+        # SIGTERM lets the server exit normally, so the store flushes its final snapshot
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        groq.shutdown()
+
+    store = ProgressStore(os.path.join(workdir, PROGRESS_FILE))
+    persisted = {topic: dict(fields) for topic, fields in store.state.items()}
+    store.close()
+    problems = lost_updates(persisted, expected)
+
+    latencies = stats['latencies']
+    exceptions = stats['exceptions']
+    print("\n📊 LOAD TEST RESULTS")
+    print("=" * 50)
+    print(f"Reruns:            {len(latencies)}")
+    for pct in (50, 90, 95, 99):
+        print(f"Rerun p{pct}:         {percentile(latencies, pct)*1000:8.1f} ms")
+    print(f"Rerun max:         {max(latencies, default=0)*1000:8.1f} ms")
+    print(f"Throughput:        {len(latencies)/elapsed:8.1f} reruns/s, {stats['flows']/elapsed:.2f} flows/s")
+    if rss_before is not None and rss_after is not None:
+        print(f"Server memory:     {rss_after/1024/1024:8.1f} MiB, "
+              f"{(rss_after - rss_before)/1024/max(1, args.learners):.0f} KiB/session growth")
+    else:
+        print("Server memory:     n/a (needs /proc)")
+    print(f"Lost updates:      {len(problems)}")
+    for p in problems[:10]:
+        print(f"  ❌ {p}")
+    print(f"Save errors shown: {stats['save_errors']}")
+    print(f"Exceptions:        {len(exceptions)}")
+    for e in sorted(set(exceptions))[:10]:
+        print(f"  ❌ {e}")
+
+    failed = bool(exceptions)
+    if args.max_p95_ms is not None and percentile(latencies, 95) * 1000 > args.max_p95_ms:
+        print(f"❌ p95 above {args.max_p95_ms:.0f} ms budget")
+        failed = True
+    errors = len(problems) + stats['save_errors']
+    if args.max_errors is not None and errors > args.max_errors:
+        print(f"❌ {errors} lost updates / save errors (max {args.max_errors})")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Dict, List
+from langchain_core.runnables import Runnable, RunnableLambda
+
+# 🔥 WHICH MODEL TIER SERVES WHICH AGENT STEP
+TASK_TIERS = {
+    "gather_context": "fast",
+    "regenerate_context": "large",
+    "generate_quiz": "fast",
+    "explain_concept": "large",
+    "feynman_explain": "large",
+}
+
+# Primary first, then hedge / fallback backends. Override with comma-separated
+# GROQ_FAST_MODELS / GROQ_LARGE_MODELS. The large tier hedges with a second
+# request to the same model so explanations never drop to the small one.
+DEFAULT_MODELS = {
+    "fast": "llama-3.1-8b-instant,llama-3.3-70b-versatile",
+    "large": "llama-3.3-70b-versatile,llama-3.3-70b-versatile",
+}
+
+
+class ModelRouter:
+    """Routes each agent step to a model tier with hedged requests and fallback.
+
+    A tier is an ordered list of backends (any LangChain Runnable). The primary
+    is called first; if it has not answered within its recent p95 latency the
+    next backend is started as a hedge and the first good answer wins. Errors
+    skip straight to the next backend.
+    """
+
+    def __init__(self, tiers: Dict[str, List[Runnable]], task_tiers: Dict[str, str] = None,
+                 hedge_percentile: float = 95, default_deadline: float = 8.0,
+                 min_samples: int = 20, window: int = 200):
+        for tier, backends in tiers.items():
+            if not backends:
+                raise ValueError(f"Model tier '{tier}' has no backends configured")
+        self.tiers = tiers
+        self.task_tiers = task_tiers or TASK_TIERS
+        self.hedge_percentile = hedge_percentile
+        self.default_deadline = default_deadline
+        self.min_samples = min_samples
+        self.latencies = {(tier, i): deque(maxlen=window)
+                          for tier, backends in tiers.items() for i in range(len(backends))}
+
+    @classmethod
+    def from_env(cls, temperature: float = 0.1):
+        from langchain_groq import ChatGroq
+        tiers = {}
+        for tier, default in DEFAULT_MODELS.items():
+            env_var = f"GROQ_{tier.upper()}_MODELS"
+            names = [name.strip() for name in os.getenv(env_var, default).split(",") if name.strip()]
+            if not names:
+                raise ValueError(f"{env_var} must list at least one model name")
+            tiers[tier] = [ChatGroq(groq_api_key=os.getenv("GROQ_API_KEY"),
+                                    model_name=name, temperature=temperature)
+                           for name in names]
+        return cls(tiers, default_deadline=float(os.getenv("LLM_HEDGE_DEADLINE", "8.0")))
+
+    def for_task(self, task: str) -> Runnable:
+        """Runnable for `prompt | router.for_task(...)` chains"""
+        async def invoke(prompt):
+            return await self.ainvoke(task, prompt)
+        return RunnableLambda(invoke, name=f"route:{task}")
+
+    def deadline(self, tier: str, index: int) -> float:
+        samples = self.latencies[(tier, index)]
+        if len(samples) < self.min_samples:
+            return self.default_deadline
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))]
+
+    async def _timed(self, tier, index, backend, prompt):
+        start = time.perf_counter()
+        try:
+            result = await backend.ainvoke(prompt)
+        except asyncio.CancelledError:
+            # Lost the hedge race: elapsed time is a lower bound, still worth keeping
+            self.latencies[(tier, index)].append(time.perf_counter() - start)
+            raise
+        self.latencies[(tier, index)].append(time.perf_counter() - start)
+        return result
+
+    async def ainvoke(self, task: str, prompt):
+        tier = self.task_tiers.get(task, "large")
+        backends = self.tiers[tier]
+        pending = {asyncio.ensure_future(self._timed(tier, 0, backends[0], prompt))}
+        launched = 1
+        error = None
+        try:
+            while pending:
+                timeout = self.deadline(tier, launched - 1) if launched < len(backends) else None
+                done, pending = await asyncio.wait(pending, timeout=timeout,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task_future in done:
+                    if task_future.exception() is None:
+                        return task_future.result()
+                    error = task_future.exception()
+                # Deadline passed or a backend failed → bring in the next one
+                if launched < len(backends):
+                    pending.add(asyncio.ensure_future(
+                        self._timed(tier, launched, backends[launched], prompt)))
+                    launched += 1
+        finally:
+            for task_future in pending:
+                task_future.cancel()
+        raise error
@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import atexit
+import threading
+from datetime import datetime
+from checkpoints import CHECKPOINTS
+
+
+def default_progress():
+    return {concept: {
+        'completed': False, 'score': 0, 'attempts': 0, 'best_score': 0,
+        'last_score': 0, 'feynman_level': 0, 'feynman_attempts_used': 0,
+        'last_updated': datetime.now().isoformat()
+    } for concept in CHECKPOINTS}
+
+
+class ProgressStore:
+    """In-memory progress with a write-behind journal and atomic snapshots.
+
+    update()/increment()/record_score()/reset() change `state` under the lock
+    and queue the resulting absolute values as an event; a background
+    thread appends queued events to `<path>.journal` with one fsync per batch and
+    every `snapshot_every` events rewrites `<path>` via tmp file + os.replace.
+    A snapshot is taken together with the batch that precedes it, so it holds
+    exactly the journaled events and replaying the journal over it is a no-op.
+    On startup the snapshot is loaded and the journal replayed; a torn last line
+    from a crash is dropped. Failed writes are retried and counted in
+    `write_errors`; `last_error` stays set until a write succeeds.
+
+    The files belong to one process: several processes sharing them each keep
+    their own state and may truncate each other's journaled events.
+    """
+
+    def __init__(self, path: str, snapshot_every: int = 50, flush_interval: float = 0.2):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.snapshot_every = snapshot_every
+        self.flush_interval = flush_interval
+        self.last_error = None
+        self.write_errors = 0
+        self.recovered = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = []
+        self._closing = False
+        self.state = self._load()
+        self._journal_fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._thread = threading.Thread(target=self._writer, name="progress-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # 🔥 STARTUP: SNAPSHOT + JOURNAL REPLAY
+    def _load(self):
+        state = default_progress()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+            except (OSError, ValueError) as e:
+                self.recovered.append(f"snapshot unreadable ({e}), using defaults")
+            else:
+                if not isinstance(loaded, dict):
+                    self.recovered.append(f"snapshot is {type(loaded).__name__}, not an object, using defaults")
+                    loaded = {}
+                for concept, fields in loaded.items():
+                    if isinstance(fields, dict):
+                        state.setdefault(concept, {}).update(fields)
+                    else:
+                        self.recovered.append(f"snapshot entry '{concept}' is not an object, using defaults")
+        if os.path.exists(self.journal_path):
+            try:
+                with open(self.journal_path, 'rb') as f:
+                    lines = f.read().split(b"\n")
+            except OSError as e:
+                self.recovered.append(f"journal unreadable ({e}), not replayed")
+                return state
+            for line_no, line in enumerate(lines[:-1], start=1):
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    event = None
+                if self._valid_event(event):
+                    self._apply(state, event)
+                else:
+                    self.recovered.append(f"skipped bad journal line {line_no}")
+            if lines[-1]:
+                # Crash mid-append: drop the torn tail so new events start on a clean line
+                self.recovered.append(f"dropped torn journal line {len(lines)}")
+                with open(self.journal_path, 'rb+') as f:
+                    f.truncate(sum(len(line) + 1 for line in lines[:-1]))
+        return state
+
+    @staticmethod
+    def _valid_event(event):
+        if not isinstance(event, dict):
+            return False
+        if event.get('reset') is True:
+            return True
+        return isinstance(event.get('concept'), str) and isinstance(event.get('fields'), dict)
+
+    @staticmethod
+    def _apply(state, event):
+        if event.get('reset'):
+            # Replace entries in place: sessions read `state` without the lock,
+            # so concepts must never disappear mid-rerun
+            for concept, fields in default_progress().items():
+                state[concept] = fields
+        else:
+            state.setdefault(event['concept'], {}).update(event['fields'])
+
+    # 🔥 REQUEST PATH: MEMORY ONLY, NEVER DISK
+    # Read-modify-write helpers compute new values under the lock so concurrent
+    # sessions never lose increments; the journal stores the absolute results
+    def update(self, concept, **fields):
+        self._merge(concept, lambda current: fields)
+
+    def increment(self, concept, *fields):
+        self._merge(concept, lambda current: {name: current.get(name, 0) + 1 for name in fields})
+
+    def record_score(self, concept, score, passed):
+        self._merge(concept, lambda current: {
+            'last_score': score,
+            'best_score': max(current.get('best_score', 0), score),
+            'completed': bool(current.get('completed')) or passed,
+        })
+
+    def reset(self):
+        with self._wakeup:
+            self._append({'reset': True})
+
+    def _merge(self, concept, compute):
+        with self._wakeup:
+            fields = dict(compute(self.state.get(concept, {})))
+            fields.setdefault('last_updated', datetime.now().isoformat())
+            self._append({'concept': concept, 'fields': fields})
+
+    def _append(self, event):
+        # Caller holds the lock, so journal order matches the order applied
+        self._apply(self.state, event)
+        self._pending.append(json.dumps(event))
+        self._wakeup.notify()
+
+    # 🔥 BACKGROUND WRITER
+    def _writer(self):
+        since_snapshot = 0
+        torn = False
+        while True:
+            with self._wakeup:
+                if not self._pending and not self._closing:
+                    self._wakeup.wait(self.flush_interval)
+                batch, self._pending = self._pending, []
+                closing = self._closing
+                snapshot_due = (since_snapshot + len(batch) >= self.snapshot_every
+                                or (closing and (since_snapshot or batch)))
+                # Dumped with the batch taken, so snapshot == journal contents after this write
+                snapshot = json.dumps(self.state, indent=2) if snapshot_due else None
+            if batch:
+                try:
+                    # A failed write may have left half a line; start the retry on a fresh one
+                    self._write_journal(("\n" if torn else "") + "\n".join(batch) + "\n")
+                    torn = False
+                    since_snapshot += len(batch)
+                    self.last_error = None
+                except OSError as e:
+                    self._failed(e)
+                    torn = True
+                    with self._wakeup:
+                        self._pending[:0] = batch
+                    if closing:
+                        return
+                    time.sleep(self.flush_interval)
+                    continue
+            if snapshot is not None:
+                try:
+                    self._snapshot(snapshot)
+                    since_snapshot = 0
+                except OSError as e:
+                    self._failed(e)
+            if closing:
+                return
+
+    def _failed(self, error):
+        self.write_errors += 1
+        self.last_error = error
+
+    def _write_journal(self, text):
+        data = text.encode('utf-8')
+        while data:
+            written = os.write(self._journal_fd, data)
+            data = data[written:]
+        os.fsync(self._journal_fd)
+
+    def _snapshot(self, data):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # The rename must be durable before the journal it replaces is dropped
+        if hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        os.ftruncate(self._journal_fd, 0)
+        os.fsync(self._journal_fd)
+
+    def close(self):
+        with self._wakeup:
+            if self._closing:
+                return
+            self._closing = True
+            self._wakeup.notify()
+        self._thread.join()
+        os.close(self._journal_fd)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(path: str) -> ProgressStore:
+    """Process-wide store for `path`, shared by every session (and the load test)"""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ProgressStore(path)
+        return _stores[key]
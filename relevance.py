@@ -0,0 +1,50 @@
+import re
+import math
+from checkpoints import CONCEPT_KEYWORDS
+
+# Weighted keyword coverage that counts as a fully on-topic context
+FULL_COVERAGE = 0.6
+# Contexts shorter than this many words are scaled down proportionally
+MIN_WORDS = 100
+
+
+def _normalize(text: str) -> str:
+    return " " + re.sub(r"[^a-z0-9]+", " ", text.lower()) + " "
+
+
+def _pattern(keyword: str):
+    alternatives = [_normalize(k).strip() for k in keyword.split("|")]
+    return re.compile(r"\b(?:" + "|".join(re.escape(a) for a in alternatives) + ")")
+
+
+# 🔥 PRECOMPILED INDEX: keyword regexes + IDF across concepts, so shared terms
+# like "gradient" or "layer" count less than "chain rule" or "dropout"
+_DOC_FREQ = {}
+for _keywords in CONCEPT_KEYWORDS.values():
+    for _kw in set(_keywords):
+        _DOC_FREQ[_kw] = _DOC_FREQ.get(_kw, 0) + 1
+
+_INDEX = {
+    concept: [(_pattern(kw), math.log((len(CONCEPT_KEYWORDS) + 1) / (_DOC_FREQ[kw] + 1)) + 1)
+              for kw in keywords]
+    for concept, keywords in CONCEPT_KEYWORDS.items()
+}
+
+
+def score_relevance(concept: str, context: str) -> int:
+    """0-100 relevance of `context` to `concept` from IDF-weighted keyword coverage"""
+    index = _INDEX.get(concept) or [(_pattern(word), 1.0) for word in _normalize(concept).split()]
+    text = _normalize(context or "")
+    total = sum(weight for _, weight in index)
+    if total == 0:
+        return 0
+    matched = sum(weight for pattern, weight in index if pattern.search(text))
+    coverage = min(1.0, matched / total / FULL_COVERAGE)
+    length_factor = min(1.0, len(text.split()) / MIN_WORDS)
+    return round(100 * coverage * length_factor)
+
+
+def key_terms(concept: str, limit: int = 6):
+    """Most concept-specific index terms (highest IDF first), for corrective prompts"""
+    keywords = sorted(CONCEPT_KEYWORDS.get(concept, []), key=lambda kw: _DOC_FREQ[kw])
+    return [kw.split("|")[0] for kw in keywords[:limit]]
@@ -0,0 +1,55 @@
+import asyncio
+import time
+import pytest
+from langchain_core.runnables import RunnableLambda
+from model_router import ModelRouter
+
+
+def backend(name, delay=0.0, fail=False):
+    async def respond(prompt):
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(name)
+        return name
+    return RunnableLambda(respond)
+
+
+def test_slow_primary_loses_to_hedge():
+    router = ModelRouter({"fast": [backend("primary", delay=2.0), backend("hedge", delay=0.01)]},
+                         default_deadline=0.05)
+    start = time.perf_counter()
+    assert asyncio.run(router.ainvoke("generate_quiz", "prompt")) == "hedge"
+    assert time.perf_counter() - start < 1.0
+
+
+def test_failing_primary_falls_back():
+    router = ModelRouter({"large": [backend("primary", fail=True), backend("fallback")]},
+                         default_deadline=5.0)
+    start = time.perf_counter()
+    assert asyncio.run(router.ainvoke("explain_concept", "prompt")) == "fallback"
+    # Errors skip the hedge deadline entirely
+    assert time.perf_counter() - start < 1.0
+
+
+def test_all_backends_failing_raises():
+    router = ModelRouter({"large": [backend("a", fail=True), backend("b", fail=True)]})
+    with pytest.raises(RuntimeError, match="b"):
+        asyncio.run(router.ainvoke("feynman_explain", "prompt"))
+
+
+def test_deadline_tracks_primary_latency():
+    router = ModelRouter({"fast": [backend("primary", delay=0.01), backend("hedge")]}, min_samples=5)
+    for _ in range(5):
+        asyncio.run(router.ainvoke("gather_context", "prompt"))
+    assert router.deadline("fast", 0) < router.default_deadline
+
+
+def test_empty_tier_rejected():
+    with pytest.raises(ValueError, match="fast"):
+        ModelRouter({"fast": [], "large": [backend("large")]})
+
+
+def test_from_env_rejects_blank_model_list(monkeypatch):
+    monkeypatch.setenv("GROQ_FAST_MODELS", " , ,")
+    with pytest.raises(ValueError, match="GROQ_FAST_MODELS"):
+        ModelRouter.from_env()
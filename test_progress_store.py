@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import errno
+import threading
+import progress_store
+from progress_store import ProgressStore
+
+
+def write_journal(path, *events, tail=""):
+    with open(path + ".journal", "w", encoding="utf-8") as f:
+        f.write("".join(json.dumps(e) + "\n" for e in events) + tail)
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_torn_last_journal_line_keeps_earlier_progress(tmp_path):
+    path = str(tmp_path / "progress.json")
+    write_journal(path, {"concept": "Gradient Descent", "fields": {"attempts": 3}},
+                  tail='{"concept": "Backpropagation", "fie')
+    store = ProgressStore(path)
+    assert store.state["Gradient Descent"]["attempts"] == 3
+    assert store.recovered == ["dropped torn journal line 2"]
+    store.update("Backpropagation", attempts=1)
+    store.close()
+
+    reopened = ProgressStore(path)
+    assert reopened.state["Gradient Descent"]["attempts"] == 3
+    assert reopened.state["Backpropagation"]["attempts"] == 1
+    assert reopened.recovered == []
+    reopened.close()
+
+
+def test_corrupt_snapshot_still_replays_journal(tmp_path):
+    path = str(tmp_path / "progress.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"Gradient Descent": {"attempts": 9')
+    write_journal(path, {"concept": "Adam Optimizer", "fields": {"best_score": 80}})
+    store = ProgressStore(path)
+    assert store.state["Adam Optimizer"]["best_score"] == 80
+    assert store.state["Gradient Descent"]["attempts"] == 0
+    assert store.recovered[0].startswith("snapshot unreadable")
+    store.close()
+
+
+def test_reset_then_updates_replay_in_order(tmp_path):
+    path = str(tmp_path / "progress.json")
+    write_journal(path,
+                  {"concept": "Dropout Regularization", "fields": {"attempts": 5, "completed": True}},
+                  {"concept": "Early Stopping", "fields": {"attempts": 2}},
+                  {"reset": True},
+                  {"concept": "Early Stopping", "fields": {"attempts": 1}})
+    store = ProgressStore(path)
+    assert store.state["Dropout Regularization"]["attempts"] == 0
+    assert store.state["Dropout Regularization"]["completed"] is False
+    assert store.state["Early Stopping"]["attempts"] == 1
+    store.close()
+
+
+def test_reset_never_removes_concepts(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.json"))
+    state = store.state
+    keys = list(state)
+    store.reset()
+    assert store.state is state
+    assert list(state) == keys
+    store.close()
+
+
+def test_failed_write_is_retried_and_reported(tmp_path, monkeypatch):
+    path = str(tmp_path / "progress.json")
+    store = ProgressStore(path, flush_interval=0.05)
+    real_fsync = os.fsync
+    calls = []
+
+    def flaky_fsync(fd):
+        calls.append(fd)
+        if len(calls) == 1:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        real_fsync(fd)
+
+    monkeypatch.setattr(progress_store.os, "fsync", flaky_fsync)
+    store.update("Loss Functions", attempts=4)
+    wait_for(lambda: store.write_errors == 1)
+    wait_for(lambda: store.last_error is None)
+    store.close()
+    monkeypatch.undo()
+
+    reopened = ProgressStore(path)
+    assert reopened.state["Loss Functions"]["attempts"] == 4
+    reopened.close()
+
+
+def test_snapshot_truncates_journal(tmp_path):
+    path = str(tmp_path / "progress.json")
+    store = ProgressStore(path, snapshot_every=2, flush_interval=0.05)
+    store.update("Transfer Learning", attempts=1)
+    store.update("Transfer Learning", attempts=2)
+    wait_for(lambda: os.path.exists(path))
+    wait_for(lambda: os.path.getsize(path + ".journal") == 0)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["Transfer Learning"]["attempts"] == 2
+    store.close()
+
+
+def test_wrong_shape_snapshot_falls_back_to_defaults(tmp_path):
+    path = str(tmp_path / "progress.json")
+    for snapshot in ("null", "[]", '{"Gradient Descent": 5, "Adam Optimizer": {"attempts": 2}}'):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+        store = ProgressStore(path)
+        assert store.state["Gradient Descent"]["attempts"] == 0
+        assert store.recovered
+        store.close()
+        os.remove(path + ".journal")
+    # Valid entries next to a bad one are kept
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"Gradient Descent": 5, "Adam Optimizer": {"attempts": 2}}')
+    store = ProgressStore(path)
+    assert store.state["Adam Optimizer"]["attempts"] == 2
+    store.close()
+
+
+def test_wrong_shape_journal_lines_are_skipped(tmp_path):
+    path = str(tmp_path / "progress.json")
+    with open(path + ".journal", "w", encoding="utf-8") as f:
+        f.write('[]\n5\n{"concept": "Dropout Regularization"}\n'
+                '{"concept": "Early Stopping", "fields": {"attempts": 3}}\n')
+    store = ProgressStore(path)
+    assert store.state["Early Stopping"]["attempts"] == 3
+    assert store.recovered == [f"skipped bad journal line {n}" for n in (1, 2, 3)]
+    store.close()
+
+
+def test_concurrent_increments_and_scores_are_not_lost(tmp_path):
+    path = str(tmp_path / "progress.json")
+    store = ProgressStore(path)
+
+    def learner(score):
+        for _ in range(200):
+            store.increment("Backpropagation", "attempts")
+        store.record_score("Backpropagation", score, passed=score >= 70)
+
+    threads = [threading.Thread(target=learner, args=(score,)) for score in (90, 40, 10, 75)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert store.state["Backpropagation"]["attempts"] == 800
+    assert store.state["Backpropagation"]["best_score"] == 90
+    assert store.state["Backpropagation"]["completed"] is True
+    store.close()
+
+    reopened = ProgressStore(path)
+    assert reopened.state["Backpropagation"]["attempts"] == 800
+    assert reopened.state["Backpropagation"]["best_score"] == 90
+    reopened.close()
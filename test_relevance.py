@@ -0,0 +1,89 @@
+import os
+import asyncio
+import importlib
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from model_router import ModelRouter
+from relevance import score_relevance
+from state import LearningState
+
+GRADIENT_DESCENT = (
+    "Gradient descent is an iterative optimization algorithm used to minimize a cost function. "
+    "Introduced by Cauchy in 1847, it updates parameters in the direction of the negative gradient, "
+    "the slope of the loss surface. The learning rate controls the step size: too large and it "
+    "diverges, too small and convergence is slow. Variants include batch, stochastic gradient descent "
+    "and mini-batch. It can get stuck in local minima or saddle points. The derivative of the loss "
+    "with respect to each weight is usually computed by backpropagation in neural networks. It is used "
+    "in linear regression, logistic regression and deep learning, and each iteration moves closer to "
+    "the minimum until the algorithm converges."
+)
+OFF_TOPIC = "The French Revolution began in 1789 with the storming of the Bastille in Paris. " * 10
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    # Keep tracing off and keys set only for this test; learning_agent reads them at import
+    monkeypatch.setenv("LANGCHAIN_TRACING_V2", "false")
+    monkeypatch.setenv("LANGSMITH_API_KEY", os.getenv("LANGSMITH_API_KEY", ""))
+    monkeypatch.setenv("GROQ_API_KEY", os.getenv("GROQ_API_KEY", "test"))
+    return importlib.import_module("learning_agent")
+
+
+def stand_in_router(monkeypatch, agent, context):
+    calls = []
+
+    async def respond(prompt):
+        calls.append(prompt.to_string())
+        return AIMessage(content=context)
+
+    backend = RunnableLambda(respond)
+    monkeypatch.setattr(agent, "router", ModelRouter({"fast": [backend], "large": [backend]}))
+    return calls
+
+
+def test_on_topic_context_passes(agent):
+    assert score_relevance("Gradient Descent", GRADIENT_DESCENT) >= agent.RELEVANCE_THRESHOLD
+
+
+def test_off_topic_context_fails(agent):
+    assert score_relevance("Gradient Descent", OFF_TOPIC) < agent.RELEVANCE_THRESHOLD
+
+
+def test_sibling_concept_scores_low(agent):
+    sibling = score_relevance("Early Stopping", GRADIENT_DESCENT)
+    assert sibling < agent.RELEVANCE_THRESHOLD
+    assert sibling < score_relevance("Gradient Descent", GRADIENT_DESCENT)
+
+
+def test_empty_concept_scores_zero():
+    assert score_relevance("", GRADIENT_DESCENT) == 0
+    assert score_relevance(LearningState().concept, "") == 0
+
+
+def test_off_topic_context_regenerated_once(agent, monkeypatch):
+    calls = stand_in_router(monkeypatch, agent, GRADIENT_DESCENT)
+    state = LearningState(concept="Gradient Descent", context=OFF_TOPIC)
+    asyncio.run(agent.validate_context(state))
+    assert len(calls) == 1
+    assert "off-topic" in calls[0] and "cost function" in calls[0]
+    assert state.context == GRADIENT_DESCENT
+    assert state.relevance_score >= agent.RELEVANCE_THRESHOLD
+
+
+def test_worse_regeneration_keeps_first_context(agent, monkeypatch):
+    calls = stand_in_router(monkeypatch, agent, "Sorry, I cannot help with that.")
+    weak = GRADIENT_DESCENT[:100] + " " + OFF_TOPIC
+    state = LearningState(concept="Gradient Descent", context=weak)
+    asyncio.run(agent.validate_context(state))
+    assert len(calls) == 1
+    assert state.context == weak
+    assert state.relevance_score == score_relevance("Gradient Descent", weak)
+
+
+def test_on_topic_context_not_regenerated(agent, monkeypatch):
+    calls = stand_in_router(monkeypatch, agent, OFF_TOPIC)
+    state = LearningState(concept="Gradient Descent", context=GRADIENT_DESCENT)
+    asyncio.run(agent.validate_context(state))
+    assert calls == []
+    assert state.context == GRADIENT_DESCENT